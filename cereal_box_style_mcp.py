@@ -1,15 +1,33 @@
 #!/usr/bin/env python3
-"""Wrapper to run cereal box style MCP server with correct path."""
+"""Wrapper to run cereal box style MCP server from a source checkout.
 
+Installed copies should use the ``cereal-box-style-mcp`` console script
+(or ``python -m cereal_box_style_mcp``) instead.
+"""
+
+import importlib
+import importlib.util
 import sys
 from pathlib import Path
 
-# Add src to path
-src_path = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_path))
+PACKAGE_DIR = Path(__file__).parent / "src" / "cereal_box_style_mcp"
+
+
+def _load_server():
+    """Import the server from src/ without adding it to sys.path."""
+    spec = importlib.util.spec_from_file_location(
+        "cereal_box_style_mcp",
+        PACKAGE_DIR / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_DIR)]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = package
+    spec.loader.exec_module(package)
+    return importlib.import_module("cereal_box_style_mcp.server")
+
 
 # Import and expose the mcp object
-from cereal_box_style_mcp.server import mcp
+mcp = _load_server().mcp
 
 if __name__ == "__main__":
     mcp.run()
@@ -11,27 +11,165 @@ Transforms user image prompts through 7 cereal box design aesthetics:
 - Adventure Fantasy: Cinematic epic scale, magical effects
 """
 
+import hashlib
+import heapq
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
 from fastmcp import FastMCP
 from pathlib import Path
-import json
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, TypedDict
+
+try:
+    import orjson as _json
+except ImportError:  # orjson is an optional speedup
+    import json as _json
+
+try:
+    import xxhash
+except ImportError:  # fall back to hashlib for cache keys
+    xxhash = None
 
 from .tools.parser import parse_prompt_components
 from .tools.transformer import apply_category_transformation
 from .tools.utils import (
+    calculate_emphasis,
     calculate_semantic_weights,
+    flatten_search_text,
     order_by_importance,
-    generate_negative_prompt
+    generate_negative_prompt,
+    text_length
 )
 
 # Initialize FastMCP
 mcp = FastMCP("Cereal Box Style Transformer")
 
-# Load data files
+
+def _load(path: Path) -> Any:
+    """Parse a bundled JSON data file."""
+    return _json.loads(path.read_bytes())
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert loaded JSON into read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Unwrap frozen mappings into plain dicts that FastMCP can serialize.
+    
+    Tuples of atoms are shared as-is; tuples holding mappings are rebuilt
+    so no MappingProxyType survives inside them.
+    """
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple) and any(isinstance(v, (MappingProxyType, tuple)) for v in value):
+        return tuple(_thaw(v) for v in value)
+    return value
+
+
+# Load data files (static for the process lifetime, so parsed once and frozen)
 DATA_DIR = Path(__file__).parent / "data"
-CATEGORIES = json.loads((DATA_DIR / "categories.json").read_text())
-TRANSFORMATION_MAPS = json.loads((DATA_DIR / "transformation_maps.json").read_text())
-TEMPLATES = json.loads((DATA_DIR / "templates.json").read_text())
+CATEGORIES = _freeze(_load(DATA_DIR / "categories.json"))
+TRANSFORMATION_MAPS = _freeze(_load(DATA_DIR / "transformation_maps.json"))
+TEMPLATES = _freeze(_load(DATA_DIR / "templates.json"))
+_VALID_CATEGORIES = frozenset(CATEGORIES)
+_NEGATIVE_PROMPTS = {name: generate_negative_prompt(name, CATEGORIES) for name in CATEGORIES}
+
+# Serializable views of the static data, built once and shared between
+# calls (no tool mutates them, so they must be treated as read-only)
+_CATEGORY_RULES = {name: _thaw(rules) for name, rules in CATEGORIES.items()}
+_TEMPLATE_VIEWS = {name: _thaw(template) for name, template in TEMPLATES.items()}
+
+# Per-category scoring tables for suggest_category
+_CATEGORY_INDEX = {
+    name: {
+        'ideal': frozenset(rules.get('ideal_subjects', [])),
+        'moods': frozenset(rules.get('compatible_moods', [])),
+        'keywords': tuple(rules.get('trigger_keywords', []))
+    }
+    for name, rules in CATEGORIES.items()
+}
+
+# Energy-level scoring groups for suggest_category
+_HIGH_ENERGY = frozenset({'high', 'extreme'})
+_DYNAMIC_CATEGORIES = frozenset({'kid_chaos', 'mascot_theater'})
+_MINIMAL_CATEGORIES = frozenset({'health_halo', 'premium_disruptor'})
+
+# Category overview returned by get_available_categories. Built once and
+# shared between calls, so it must be treated as read-only. FastMCP cannot
+# serialize MappingProxyType, hence plain dicts over the frozen tuples.
+_AVAILABLE_CATEGORIES = {
+    name: {
+        'description': cat['description'],
+        'visual_dna': cat['visual_dna'],
+        'ideal_for': cat.get('ideal_subjects', ()),
+        'mood_match': cat.get('compatible_moods', ())
+    }
+    for name, cat in CATEGORIES.items()
+}
+
+# Trigger keyword -> categories that list it, plus one regex matching any
+# keyword as a whole word (longest first so 'high-end' beats a shorter prefix)
+_KEYWORD_TO_CATEGORIES: Dict[str, List[str]] = {}
+for _name, _index in _CATEGORY_INDEX.items():
+    for _keyword in _index['keywords']:
+        _KEYWORD_TO_CATEGORIES.setdefault(_keyword.lower(), []).append(_name)
+_KEYWORD_RE = re.compile(
+    r'\b(?:' + '|'.join(
+        re.escape(keyword) for keyword in sorted(_KEYWORD_TO_CATEGORIES, key=len, reverse=True)
+    ) + r')\b',
+    re.IGNORECASE
+)
+
+# Memoization for repeated prompts (MCP clients often re-issue them).
+# FastMCP runs sync tools on worker threads, so cache writes take a lock.
+_CACHE_SIZE = 512
+_CACHE_LOCK = threading.Lock()
+_TRANSFORM_CACHE: Dict[int, Dict] = {}
+
+
+def _cache_key(obj: Any) -> int:
+    """64-bit hash of the canonical JSON encoding of a tool's inputs."""
+    if _json.__name__ == 'orjson':
+        data = _json.dumps(obj, option=_json.OPT_SORT_KEYS)
+    else:
+        data = _json.dumps(obj, sort_keys=True).encode()
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def _copy_components(components: Dict) -> Dict:
+    """Copy parsed components along their known shape.
+    
+    Values are sub-dicts, lists of strings or scalars, and sub-dict values
+    are at most lists of strings, so two levels are enough (and much
+    cheaper than copy.deepcopy).
+    """
+    copied = {}
+    for key, value in components.items():
+        if isinstance(value, dict):
+            value = {k: list(v) if isinstance(v, list) else v for k, v in value.items()}
+        elif isinstance(value, list):
+            value = list(value)
+        copied[key] = value
+    return copied
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _parse_cached(user_prompt: str) -> Dict:
+    components = parse_prompt_components(user_prompt, TRANSFORMATION_MAPS)
+    components['semantic_weights'] = calculate_semantic_weights(components)
+    components['_search_text'] = flatten_search_text(components)
+    
+    return components
 
 
 @mcp.tool()
@@ -47,6 +185,7 @@ def parse_prompt(user_prompt: str) -> Dict:
     - colors: Color keywords found
     - mood: Emotional tone (emotion, intensity)
     - semantic_weights: Importance scores for each component
+    - _search_text: Lowercased text used for category keyword matching
     
     Example:
         Input: "a tired chef tasting soup in a busy kitchen"
@@ -58,10 +197,8 @@ def parse_prompt(user_prompt: str) -> Dict:
         }
     """
     
-    components = parse_prompt_components(user_prompt, TRANSFORMATION_MAPS)
-    components['semantic_weights'] = calculate_semantic_weights(components)
-    
-    return components
+    # Cached result is shared, so hand callers their own copy
+    return _copy_components(_parse_cached(user_prompt))
 
 
 @mcp.tool()
@@ -83,15 +220,7 @@ def get_available_categories() -> Dict:
         }
     """
     
-    return {
-        name: {
-            'description': cat['description'],
-            'visual_dna': cat['visual_dna'],
-            'ideal_for': cat.get('ideal_subjects', []),
-            'mood_match': cat.get('compatible_moods', [])
-        }
-        for name, cat in CATEGORIES.items()
-    }
+    return _AVAILABLE_CATEGORIES
 
 
 @mcp.tool()
@@ -117,47 +246,52 @@ def suggest_category(parsed_components: Dict) -> Dict:
         }
     """
     
+    subject_type = parsed_components.get('subject', {}).get('type')
+    mood = parsed_components.get('mood', {}).get('emotion')
+    action_energy = parsed_components.get('action', {}).get('energy_level', 'medium')
+    high_energy = action_energy in _HIGH_ENERGY
+    low_energy = action_energy == 'low'
+    
+    # Score based on keyword triggers (one regex pass, each keyword counted once)
+    prompt_text = parsed_components.get('_search_text') or flatten_search_text(parsed_components)
+    keyword_hits = Counter()
+    for keyword in {match.group(0).lower() for match in _KEYWORD_RE.finditer(prompt_text)}:
+        keyword_hits.update(_KEYWORD_TO_CATEGORIES[keyword])
+    
     scores = {}
     
-    for category, rules in CATEGORIES.items():
+    for category, index in _CATEGORY_INDEX.items():
         score = 0
         reasons = []
         
         # Score based on subject type
-        subject_type = parsed_components.get('subject', {}).get('type')
-        if subject_type in rules.get('ideal_subjects', []):
+        if subject_type in index['ideal']:
             score += 3
             reasons.append(f"Subject type '{subject_type}' is ideal for this category")
         
         # Score based on mood
-        mood = parsed_components.get('mood', {}).get('emotion')
-        if mood in rules.get('compatible_moods', []):
+        if mood in index['moods']:
             score += 2
             reasons.append(f"Mood '{mood}' aligns with category aesthetic")
         
         # Score based on energy level
-        action_energy = parsed_components.get('action', {}).get('energy_level', 'medium')
-        if category in ['kid_chaos', 'mascot_theater'] and action_energy in ['high', 'extreme']:
+        if high_energy and category in _DYNAMIC_CATEGORIES:
             score += 2
             reasons.append("High energy matches dynamic category")
-        elif category in ['health_halo', 'premium_disruptor'] and action_energy == 'low':
+        elif low_energy and category in _MINIMAL_CATEGORIES:
             score += 2
             reasons.append("Low energy suits minimalist aesthetic")
         
-        # Score based on keyword triggers
-        prompt_text = str(parsed_components).lower()
-        for keyword in rules.get('trigger_keywords', []):
-            if keyword in prompt_text:
-                score += 1
+        score += keyword_hits[category]
         
         scores[category] = {'score': score, 'reasons': reasons}
     
-    # Sort by score
-    ranked = sorted(scores.items(), key=lambda x: x[1]['score'], reverse=True)
+    # Only the top three are reported
+    ranked = heapq.nlargest(3, scores.items(), key=lambda x: x[1]['score'])
     
     return {
         'primary_suggestion': ranked[0][0],
-        'alternatives': [cat for cat, _ in ranked[1:3]],
+        'alternatives': [cat for cat, _ in ranked[1:]],
         'scores': {cat: data['score'] for cat, data in scores.items()},
         'reasoning': '; '.join(ranked[0][1]['reasons']) if ranked[0][1]['reasons'] else 'General compatibility'
     }
@@ -186,11 +320,11 @@ def get_category_rules(category: str) -> Dict:
         ValueError: If category not found
     """
     
-    if category not in CATEGORIES:
+    if category not in _VALID_CATEGORIES:
         available = list(CATEGORIES.keys())
         raise ValueError(f"Unknown category: {category}. Available: {available}")
     
-    return CATEGORIES[category]
+    return _CATEGORY_RULES[category]
 
 
 @mcp.tool()
@@ -228,20 +362,41 @@ def apply_transformations(
         }
     """
     
-    if category not in CATEGORIES:
+    if category not in _VALID_CATEGORIES:
         raise ValueError(f"Unknown category: {category}")
     
-    rules = CATEGORIES[category]
-    params = style_params or {}
-    
-    transformed = apply_category_transformation(
+    return _transform_components(
         parsed_components,
-        rules,
-        TRANSFORMATION_MAPS,
-        params
+        category,
+        CATEGORIES[category],
+        style_params or {}
     )
+
+
+def _transform_components(
+    parsed_components: Dict,
+    category: str,
+    rules: Dict,
+    params: Dict
+) -> Dict:
+    """Cached transformation for an already validated category."""
+    
+    key = _cache_key((parsed_components, category, params))
+    transformed = _TRANSFORM_CACHE.get(key)
+    if transformed is None:
+        transformed = apply_category_transformation(
+            parsed_components,
+            rules,
+            TRANSFORMATION_MAPS,
+            params
+        )
+        with _CACHE_LOCK:
+            if len(_TRANSFORM_CACHE) >= _CACHE_SIZE:
+                del _TRANSFORM_CACHE[next(iter(_TRANSFORM_CACHE))]
+            _TRANSFORM_CACHE[key] = transformed
     
-    return transformed
+    # Values are strings, None or tuples, so a shallow copy is enough
+    return dict(transformed)
 
 
 @mcp.tool()
@@ -275,7 +430,44 @@ def build_prompt_skeleton(
         }
     """
     
-    template = TEMPLATES[category]
+    template = _TEMPLATE_VIEWS[category]
+    
+    return _assemble_skeleton(
+        transformed_components,
+        category,
+        semantic_weights,
+        template,
+        calculate_emphasis(semantic_weights),
+        _NEGATIVE_PROMPTS[category]
+    )
+
+
+class SkeletonMetadata(TypedDict, total=False):
+    category: str
+    estimated_tokens: int
+    _section_char_len: Dict[str, int]
+    ready_for_synthesis: bool
+    user_modifications: List[str]
+
+
+class Skeleton(TypedDict):
+    """Shape of the dict returned by build_prompt_skeleton."""
+    sections: Dict[str, Any]
+    emphasis: Dict[str, float]
+    template: Dict
+    negative_prompt: str
+    metadata: SkeletonMetadata
+
+
+def _assemble_skeleton(
+    transformed_components: Dict,
+    category: str,
+    semantic_weights: Dict,
+    template: Dict,
+    emphasis: Dict,
+    negative: str
+) -> Skeleton:
+    """Build a skeleton from precomputed per-category pieces."""
     
     # Order sections by importance
     ordered_sections = order_by_importance(
@@ -284,25 +476,11 @@ def build_prompt_skeleton(
         template['emphasis_order']
     )
     
-    # Calculate emphasis weights for prompt syntax
-    emphasis = {}
-    for component, weight in semantic_weights.items():
-        if weight > 60:
-            emphasis[component] = 1.3  # Strong emphasis
-        elif weight > 40:
-            emphasis[component] = 1.15  # Medium emphasis
-        elif weight > 20:
-            emphasis[component] = 1.0  # Normal
-        else:
-            emphasis[component] = 0.85  # De-emphasize
-    
-    # Generate negative prompt
-    negative = generate_negative_prompt(category, CATEGORIES)
-    
     # Estimate tokens (rough: 1 token ≈ 4 characters)
-    estimated_tokens = sum(len(str(v)) for v in ordered_sections.values()) // 4
+    section_lengths = {key: text_length(value) for key, value in ordered_sections.items()}
+    estimated_tokens = sum(section_lengths.values()) // 4
     
-    skeleton = {
+    skeleton: Skeleton = {
         'sections': ordered_sections,
         'emphasis': emphasis,
         'template': template,
@@ -310,6 +488,7 @@ def build_prompt_skeleton(
         'metadata': {
             'category': category,
             'estimated_tokens': estimated_tokens,
+            '_section_char_len': section_lengths,
             'ready_for_synthesis': True
         }
     }
@@ -349,10 +528,15 @@ def refine_component(
         skeleton['metadata']['user_modifications'] = []
     skeleton['metadata']['user_modifications'].append(component_name)
     
-    # Recalculate token estimate
-    skeleton['metadata']['estimated_tokens'] = sum(
-        len(str(v)) for v in skeleton['sections'].values()
-    ) // 4
+    # Update token estimate, re-measuring only the changed section when
+    # the skeleton carries per-section lengths
+    section_lengths = skeleton['metadata'].get('_section_char_len')
+    if section_lengths is None:
+        section_lengths = {key: text_length(value) for key, value in skeleton['sections'].items()}
+        skeleton['metadata']['_section_char_len'] = section_lengths
+    else:
+        section_lengths[component_name] = text_length(new_value)
+    skeleton['metadata']['estimated_tokens'] = sum(section_lengths.values()) // 4
     
     return skeleton
 
@@ -389,6 +573,9 @@ def generate_variants(
     if count < 1 or count > 5:
         raise ValueError("Count must be between 1 and 5")
     
+    if category not in _VALID_CATEGORIES:
+        raise ValueError(f"Unknown category: {category}")
+    
     # Define parameter variations
     param_sets = [
         {
@@ -424,21 +611,32 @@ def generate_variants(
         }
     ]
     
+    # Everything except the transformed components is the same for each variant
+    rules = CATEGORIES[category]
+    template = _TEMPLATE_VIEWS[category]
+    semantic_weights = parsed_components['semantic_weights']
+    emphasis = calculate_emphasis(semantic_weights)
+    negative = _NEGATIVE_PROMPTS[category]
+    
     variants = []
     
     for i, params in enumerate(param_sets[:count]):
         # Apply transformation with these params
-        transformed = apply_transformations(
+        transformed = _transform_components(
             parsed_components,
             category,
+            rules,
             params
         )
         
         # Build skeleton
-        skeleton = build_prompt_skeleton(
+        skeleton = _assemble_skeleton(
             transformed,
             category,
-            parsed_components['semantic_weights']
+            semantic_weights,
+            template,
+            emphasis,
+            negative
         )
         
         variants.append({
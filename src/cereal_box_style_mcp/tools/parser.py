@@ -3,6 +3,25 @@
 import re
 from typing import Dict, List, Optional
 
+# Patterns are compiled once at import; parse_prompt runs them on every call
+SUBJECT_PATTERNS = {
+    'human': re.compile(r'\b(person|people|man|woman|child|kid|adult|teenager|boy|girl|chef|doctor|firefighter|teacher|artist|musician|pilot|detective|scientist|astronaut|athlete|dancer|singer|wizard|warrior|knight|pirate|ninja|superhero)\b', re.IGNORECASE),
+    'animal': re.compile(r'\b(cat|dog|bird|fish|horse|lion|tiger|bear|elephant|dragon|phoenix|unicorn|griffin|kitten|puppy)\b', re.IGNORECASE),
+    'object': re.compile(r'\b(car|boat|plane|bicycle|train|rocket|sword|hammer|book|computer|phone|camera|chair|table)\b', re.IGNORECASE),
+    'food': re.compile(r'\b(pizza|burger|sandwich|taco|pasta|apple|banana|strawberry|cake|cookie|donut)\b', re.IGNORECASE)
+}
+
+SETTING_PATTERNS = {
+    'indoor_specific': re.compile(r'\b(kitchen|bedroom|office|classroom|library|lab|studio|garage|bathroom|hallway)\b', re.IGNORECASE),
+    'indoor_generic': re.compile(r'\b(inside|indoors|room|building|house)\b', re.IGNORECASE),
+    'outdoor_natural': re.compile(r'\b(forest|mountain|beach|desert|jungle|field|river|lake|ocean|park|garden)\b', re.IGNORECASE),
+    'outdoor_urban': re.compile(r'\b(street|city|downtown|alley|plaza|rooftop|sidewalk)\b', re.IGNORECASE),
+    'fantasy': re.compile(r'\b(castle|dungeon|spaceship|alien planet|magical realm|dimension)\b', re.IGNORECASE)
+}
+
+TIME_PATTERN = re.compile(r'\b(dawn|sunrise|morning|noon|afternoon|sunset|dusk|evening|night|midnight)\b', re.IGNORECASE)
+PROP_PATTERN = re.compile(r'\b(with|holding|carrying|near|beside)\s+(a|an|the)?\s*(\w+)\b', re.IGNORECASE)
+
 
 def parse_prompt_components(prompt: str, transformation_maps: Dict) -> Dict:
     """Parse user prompt into structured components."""
@@ -20,16 +39,8 @@ def parse_prompt_components(prompt: str, transformation_maps: Dict) -> Dict:
 def extract_subject(prompt: str, transformation_maps: Dict) -> Dict:
     """Identify primary subject with attributes."""
     
-    # Common subject patterns
-    subjects = {
-        'human': r'\b(person|people|man|woman|child|kid|adult|teenager|boy|girl|chef|doctor|firefighter|teacher|artist|musician|pilot|detective|scientist|astronaut|athlete|dancer|singer|wizard|warrior|knight|pirate|ninja|superhero)\b',
-        'animal': r'\b(cat|dog|bird|fish|horse|lion|tiger|bear|elephant|dragon|phoenix|unicorn|griffin|kitten|puppy)\b',
-        'object': r'\b(car|boat|plane|bicycle|train|rocket|sword|hammer|book|computer|phone|camera|chair|table)\b',
-        'food': r'\b(pizza|burger|sandwich|taco|pasta|apple|banana|strawberry|cake|cookie|donut)\b'
-    }
-    
-    for subject_type, pattern in subjects.items():
-        match = re.search(pattern, prompt, re.IGNORECASE)
+    for subject_type, pattern in SUBJECT_PATTERNS.items():
+        match = pattern.search(prompt)
         if match:
             subject_name = match.group(0)
             
@@ -68,6 +79,8 @@ def extract_subject(prompt: str, transformation_maps: Dict) -> Dict:
 def extract_action(prompt: str) -> Dict:
     """Identify action/verb with energy level."""
     
+    text = prompt.lower()
+    
     # Action patterns
     actions = {
         'high_energy': ['running', 'jumping', 'flying', 'racing', 'sprinting', 'leaping', 'dashing'],
@@ -77,7 +90,7 @@ def extract_action(prompt: str) -> Dict:
     
     for energy_level, verbs in actions.items():
         for verb in verbs:
-            if verb in prompt.lower():
+            if verb in text:
                 # Look for object of action
                 obj_pattern = rf'{verb}\s+(a|an|the)?\s*(\w+)'
                 obj_match = re.search(obj_pattern, prompt, re.IGNORECASE)
@@ -87,7 +100,7 @@ def extract_action(prompt: str) -> Dict:
                 intensity_modifiers = ['violently', 'intensely', 'quickly', 'slowly', 'gently', 'carefully']
                 modifier = None
                 for mod in intensity_modifiers:
-                    if mod in prompt.lower():
+                    if mod in text:
                         modifier = mod
                         break
                 
@@ -96,7 +109,7 @@ def extract_action(prompt: str) -> Dict:
                     'energy_level': energy_level.replace('_energy', ''),
                     'object': action_object,
                     'modifier': modifier,
-                    'progressive': 'ing' in prompt.lower()  # "is running" vs "runs"
+                    'progressive': 'ing' in text  # "is running" vs "runs"
                 }
     
     return {'verb': None, 'energy_level': 'low', 'object': None, 'modifier': None, 'progressive': False}
@@ -105,16 +118,10 @@ def extract_action(prompt: str) -> Dict:
 def extract_setting(prompt: str) -> Dict:
     """Identify setting/environment."""
     
-    settings = {
-        'indoor_specific': r'\b(kitchen|bedroom|office|classroom|library|lab|studio|garage|bathroom|hallway)\b',
-        'indoor_generic': r'\b(inside|indoors|room|building|house)\b',
-        'outdoor_natural': r'\b(forest|mountain|beach|desert|jungle|field|river|lake|ocean|park|garden)\b',
-        'outdoor_urban': r'\b(street|city|downtown|alley|plaza|rooftop|sidewalk)\b',
-        'fantasy': r'\b(castle|dungeon|spaceship|alien planet|magical realm|dimension)\b'
-    }
+    text = prompt.lower()
     
-    for setting_type, pattern in settings.items():
-        match = re.search(pattern, prompt, re.IGNORECASE)
+    for setting_type, pattern in SETTING_PATTERNS.items():
+        match = pattern.search(prompt)
         if match:
             location = match.group(0)
             
@@ -122,12 +129,11 @@ def extract_setting(prompt: str) -> Dict:
             attributes = []
             atmosphere_words = ['busy', 'quiet', 'dark', 'bright', 'crowded', 'empty', 'chaotic', 'peaceful']
             for word in atmosphere_words:
-                if word in prompt.lower():
+                if word in text:
                     attributes.append(word)
             
             # Time of day
-            time_pattern = r'\b(dawn|sunrise|morning|noon|afternoon|sunset|dusk|evening|night|midnight)\b'
-            time_match = re.search(time_pattern, prompt, re.IGNORECASE)
+            time_match = TIME_PATTERN.search(prompt)
             time = time_match.group(0) if time_match else None
             
             return {
@@ -145,8 +151,7 @@ def extract_objects(prompt: str) -> List[str]:
     
     # Common props
     objects = []
-    prop_pattern = r'\b(with|holding|carrying|near|beside)\s+(a|an|the)?\s*(\w+)\b'
-    matches = re.finditer(prop_pattern, prompt, re.IGNORECASE)
+    matches = PROP_PATTERN.finditer(prompt)
     
     for match in matches:
         objects.append(match.group(3))
@@ -157,12 +162,14 @@ def extract_objects(prompt: str) -> List[str]:
 def extract_colors(prompt: str) -> List[str]:
     """Extract color keywords."""
     
+    text = prompt.lower()
+    
     colors = ['red', 'blue', 'green', 'yellow', 'orange', 'purple', 'pink', 'black', 
               'white', 'brown', 'gray', 'cyan', 'magenta', 'teal', 'gold', 'silver']
     
     found_colors = []
     for color in colors:
-        if color in prompt.lower():
+        if color in text:
             found_colors.append(color)
     
     return found_colors
@@ -171,6 +178,8 @@ def extract_colors(prompt: str) -> List[str]:
 def extract_mood(prompt: str) -> Dict:
     """Identify emotional tone."""
     
+    text = prompt.lower()
+    
     emotions = {
         'positive': ['happy', 'joyful', 'excited', 'proud', 'confident', 'cheerful', 'delighted'],
         'negative': ['sad', 'angry', 'afraid', 'worried', 'frustrated', 'tired', 'exhausted', 'lonely'],
@@ -179,12 +188,12 @@ def extract_mood(prompt: str) -> Dict:
     
     for valence, emotion_list in emotions.items():
         for emotion in emotion_list:
-            if emotion in prompt.lower():
+            if emotion in text:
                 # Determine intensity
                 intensity = 'medium'
-                if 'very' in prompt.lower() or 'extremely' in prompt.lower():
+                if 'very' in text or 'extremely' in text:
                     intensity = 'high'
-                elif 'slightly' in prompt.lower() or 'a bit' in prompt.lower():
+                elif 'slightly' in text or 'a bit' in text:
                     intensity = 'low'
                 
                 return {
@@ -1,7 +1,12 @@
 """Utility functions for weighting, ordering, and prompt generation."""
 
+from bisect import bisect_left
 from typing import Dict, List
 
+# Emphasis buckets: weight <= 20, <= 40, <= 60, above 60
+EMPHASIS_THRESHOLDS = (20, 40, 60)
+EMPHASIS_VALUES = (0.85, 1.0, 1.15, 1.3)
+
 
 def calculate_semantic_weights(components: Dict) -> Dict:
     """Calculate importance scores for each component (0-100)."""
@@ -15,12 +20,16 @@ def calculate_semantic_weights(components: Dict) -> Dict:
         'mood': 0
     }
     
+    subject = components.get('subject', {})
+    action = components.get('action', {})
+    setting = components.get('setting', {})
+    
     # Base weights
-    if components.get('subject', {}).get('name'):
+    if subject.get('name'):
         weights['subject'] = 40
-    if components.get('action', {}).get('verb'):
+    if action.get('verb'):
         weights['action'] = 30
-    if components.get('setting', {}).get('location'):
+    if setting.get('location'):
         weights['setting'] = 15
     if components.get('objects'):
         weights['objects'] = 10
@@ -28,15 +37,12 @@ def calculate_semantic_weights(components: Dict) -> Dict:
         weights['mood'] = 5
     
     # Adjust based on specificity
-    subject = components.get('subject', {})
     if len(subject.get('attributes', [])) > 1 or subject.get('profession'):
         weights['subject'] += 10  # Very specific subject
     
-    action = components.get('action', {})
     if action.get('energy_level') in ['high', 'extreme']:
         weights['action'] += 10  # High energy action is important
     
-    setting = components.get('setting', {})
     if setting.get('type', '').endswith('_specific'):
         weights['setting'] += 10  # Specific location matters
     
@@ -49,6 +55,58 @@ def calculate_semantic_weights(components: Dict) -> Dict:
     return weights
 
 
+def calculate_emphasis(semantic_weights: Dict) -> Dict:
+    """Map semantic weights to prompt emphasis multipliers."""
+    
+    return {
+        component: EMPHASIS_VALUES[bisect_left(EMPHASIS_THRESHOLDS, weight)]
+        for component, weight in semantic_weights.items()
+    }
+
+
+def text_length(value) -> int:
+    """Approximate character count of a section value without building strings."""
+    
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(text_length(v) for v in value) + 2 * len(value)
+    if isinstance(value, dict):
+        return sum(text_length(k) + text_length(v) for k, v in value.items()) + 2 * len(value)
+    if value is None:
+        return 0
+    return len(str(value))
+
+
+def flatten_search_text(components: Dict) -> str:
+    """Join the textual leaves of parsed components into one lowercase string."""
+    
+    subject = components.get('subject', {})
+    action = components.get('action', {})
+    setting = components.get('setting', {})
+    mood = components.get('mood', {})
+    
+    words = [
+        subject.get('type'),
+        subject.get('name'),
+        subject.get('profession'),
+        *subject.get('attributes', []),
+        action.get('verb'),
+        action.get('object'),
+        action.get('modifier'),
+        setting.get('type'),
+        setting.get('location'),
+        *setting.get('attributes', []),
+        setting.get('time'),
+        *components.get('objects', []),
+        *components.get('colors', []),
+        mood.get('emotion')
+    ]
+    
+    # Underscores become spaces so 'outdoor_natural' still matches 'natural'
+    return ' '.join(filter(None, words)).lower().replace('_', ' ')
+
+
 def order_by_importance(
     components: Dict,
     semantic_weights: Dict,
@@ -90,6 +148,6 @@ def generate_negative_prompt(category: str, categories: Dict) -> str:
     # Category-specific negatives
     category_negatives = categories.get(category, {}).get('negative_prompts', [])
     
-    all_negatives = universal + category_negatives
+    all_negatives = universal + list(category_negatives)
     
     return ', '.join(all_negatives)